@@ -6,10 +6,11 @@ Beautiful terminal interface with web accessibility support
 import os
 import sys
 import asyncio
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-from dotenv import load_dotenv
+import re
+import time
+from collections import OrderedDict
 
+from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
 from textual.widgets import (
@@ -25,48 +26,96 @@ from textual.widgets import (
 )
 from textual.screen import Screen
 from textual.binding import Binding
+from rich.console import RenderableType
 from rich.markdown import Markdown
+from rich.markup import escape
 from rich.panel import Panel
 from rich.text import Text
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from src.assistant import DocumentAssistant
+# Interval for flushing streamed response tokens to the chat (~60 fps)
+STREAM_FLUSH_INTERVAL = 1 / 60
+
+# Maximum number of successful responses kept in the LRU response cache
+RESPONSE_CACHE_MAX = 128
+
+# Document IDs such as INV-001, CON-001 or CLM-001. Only messages naming a document
+# are cached. The cache ignores conversation context: a repeated message that names
+# a document gets the earlier answer, whatever was said in between.
+DOCUMENT_ID_RE = re.compile(r"\b[A-Z]{3}-\d{3}\b", re.IGNORECASE)
+
+HELP_TEXT = """
+# Document Assistant Help
+
+## Example Queries
+
+### Q&A
+- What's the total amount in invoice INV-001?
+- What are the terms of contract CON-001?
+- Show me details about claim CLM-001
+
+### Summarization
+- Summarize all contracts
+- Give me a summary of invoice INV-002
+- Summarize the insurance claims
+
+### Calculations
+- Calculate the sum of all invoice totals
+- What's the average amount of all documents?
+- Add the totals from INV-001 and INV-002
+
+## Keyboard Shortcuts
+- **Ctrl+D** - Show documents
+- **Ctrl+H** - Show this help
+- **Ctrl+N** - Start new session
+- **Ctrl+Q** - Quit application
+- **Enter** - Send message
+"""
+
+# Parsed once; reused every time the help screen is shown
+_HELP_MD = Markdown(HELP_TEXT)
 
 
 class MessageDisplay(Static):
     """Widget to display a single message"""
 
+    # Only what compose needs is kept; role/content/metadata are not stored
+    __slots__ = ("_css_class", "_rendered")
+
     def __init__(self, role: str, content: str, metadata: dict = None):
         super().__init__()
-        self.role = role
-        self.content = content
-        self.metadata = metadata or {}
+        self._css_class = "user-message" if role == "user" else "assistant-message"
+        # Parse markup once; the message never changes after construction
+        self._rendered = Text.from_markup(self._build_markup(role, content, metadata or {}))
+
+    @staticmethod
+    def _build_markup(role: str, content: str, metadata: dict) -> str:
+        if role == "user":
+            return f"[bold cyan]👤 You:[/bold cyan]\n{escape(content)}"
+
+        # Format assistant message with metadata footer
+        footer_lines = []
+        intent = metadata.get("intent")
+        if intent:
+            footer_lines.append(f"Intent: {intent.get('intent_type', 'unknown')}")
+        tools_used = metadata.get("tools_used")
+        if tools_used:
+            footer_lines.append(f"Tools: {', '.join(tools_used)}")
+        sources = metadata.get("sources")
+        if sources:
+            footer_lines.append(f"Sources: {', '.join(sources)}")
+        if metadata.get("cached"):
+            footer_lines.append("Cached response")
+
+        message = f"[bold green]🤖 Assistant:[/bold green]\n{escape(content)}"
+        if footer_lines:
+            message += "\n\n" + "\n".join(f"[dim]{line}[/dim]" for line in footer_lines)
+        return message
 
     def compose(self) -> ComposeResult:
-        if self.role == "user":
-            yield Static(
-                f"[bold cyan]👤 You:[/bold cyan]\n{self.content}",
-                classes="user-message",
-            )
-        else:
-            # Format assistant message with metadata
-            message = f"[bold green]🤖 Assistant:[/bold green]\n{self.content}"
-
-            if self.metadata.get("intent"):
-                intent_type = self.metadata["intent"].get("intent_type", "unknown")
-                message += f"\n\n[dim]Intent: {intent_type}[/dim]"
-
-            if self.metadata.get("tools_used"):
-                tools = ", ".join(self.metadata["tools_used"])
-                message += f"\n[dim]Tools: {tools}[/dim]"
-
-            if self.metadata.get("sources"):
-                sources = ", ".join(self.metadata["sources"])
-                message += f"\n[dim]Sources: {sources}[/dim]"
-
-            yield Static(message, classes="assistant-message")
+        yield Static(self._rendered, classes=self._css_class, markup=False)
 
 
 class DocumentAssistantApp(App):
@@ -183,6 +232,10 @@ class DocumentAssistantApp(App):
         super().__init__()
         self.assistant = None
         self.session_id = None
+        self.debug_thinking = False
+        self._scroll_pending = False
+        # LRU cache of successful results keyed by (session_id, normalized message)
+        self._response_cache = OrderedDict()
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -192,7 +245,15 @@ class DocumentAssistantApp(App):
             with Horizontal():
                 # Main chat area
                 with Vertical(id="chat-section"):
-                    yield ScrollableContainer(id="chat-container")
+                    with ScrollableContainer(id="chat-container"):
+                        # Persistent thinking indicator, shown while a request runs
+                        thinking = Static(
+                            "[bold green]🤖 Assistant:[/bold green]\n[dim italic]💭 Thinking...[/dim italic]",
+                            classes="assistant-message thinking",
+                            id="thinking-indicator",
+                        )
+                        thinking.display = False
+                        yield thinking
                     with Horizontal(id="input-container"):
                         yield Input(
                             placeholder="Type your message here...",
@@ -222,21 +283,32 @@ class DocumentAssistantApp(App):
 
     async def on_mount(self) -> None:
         """Initialize the assistant when the app starts."""
-        status = self.query_one("#status-bar", Static)
-        status.update("[yellow]⏳ Initializing assistant...[/yellow]")
+        # Cache widget lookups; these never change after mount
+        self._status = self.query_one("#status-bar", Static)
+        self._chat = self.query_one("#chat-container", ScrollableContainer)
+        self._input = self.query_one("#message-input", Input)
+        self._session_info = self.query_one("#session-info", Static)
+        self._thinking = self.query_one("#thinking-indicator", Static)
+
+        self._status.update("[yellow]⏳ Initializing assistant...[/yellow]")
+
+        # Load environment variables (imported lazily to keep startup fast)
+        from dotenv import load_dotenv
 
-        # Load environment variables
         load_dotenv()
         api_key = os.getenv("OPENAI_API_KEY")
+        self.debug_thinking = os.getenv("DEBUG_THINKING", "").lower() in ("1", "true")
 
         if not api_key:
-            status.update(
+            self._status.update(
                 "[red]❌ Error: OPENAI_API_KEY not found. Please create a .env file.[/red]"
             )
             return
 
         try:
-            # Initialize assistant
+            # Initialize assistant; deferred import keeps LangChain/OpenAI off the startup path
+            from src.assistant import DocumentAssistant
+
             self.assistant = DocumentAssistant(
                 openai_api_key=api_key, model_name="gpt-4o", temperature=0.1
             )
@@ -245,17 +317,11 @@ class DocumentAssistantApp(App):
             user_id = "textual_user"
             self.session_id = self.assistant.start_session(user_id)
 
-            # Update UI
-            session_info = self.query_one("#session-info", Static)
-            session_info.update(
+            # Prepare UI content before touching the DOM
+            session_text = (
                 f"[green]✓ Session: {self.session_id[:8]}...[/green]\n"
-                f"[dim]Started: {datetime.now().strftime('%H:%M:%S')}[/dim]"
+                f"[dim]Started: {time.strftime('%H:%M:%S')}[/dim]"
             )
-
-            status.update("[green]✓ Ready! Type your message below.[/green]")
-
-            # Add welcome message
-            chat = self.query_one("#chat-container", ScrollableContainer)
             welcome = MessageDisplay(
                 "assistant",
                 "👋 Welcome to the Document Assistant!\n\n"
@@ -265,76 +331,125 @@ class DocumentAssistantApp(App):
                 "• Performing calculations on document data\n\n"
                 "Try asking: 'What's the total amount in invoice INV-001?'",
             )
-            await chat.mount(welcome)
+
+            # Apply all updates in a single layout/paint pass
+            with self.batch_update():
+                self._session_info.update(session_text)
+                self._status.update("[green]✓ Ready! Type your message below.[/green]")
+                mounted = self._chat.mount_all([welcome], before=self._thinking)
+            await mounted
 
         except Exception as e:
-            status.update(f"[red]❌ Error: {str(e)}[/red]")
+            self._status.update(f"[red]❌ Error: {str(e)}[/red]")
 
-    async def on_button_pressed(self, event: Button.Pressed) -> None:
-        """Handle button press."""
-        if event.button.id == "send-button":
-            await self.send_message()
+    @on(Button.Pressed, "#send-button")
+    async def _on_send(self) -> None:
+        """Handle send button press."""
+        await self.send_message()
 
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
+    @on(Input.Submitted, "#message-input")
+    async def _on_message_submitted(self) -> None:
         """Handle input submission (Enter key)."""
-        if event.input.id == "message-input":
-            await self.send_message()
+        await self.send_message()
 
     async def send_message(self) -> None:
         """Send a message to the assistant."""
-        message_input = self.query_one("#message-input", Input)
-        user_message = message_input.value.strip()
+        user_message = self._input.value.strip()
 
         if not user_message:
             return
 
         # Clear input
-        message_input.value = ""
-
-        # Get widgets
-        chat = self.query_one("#chat-container", ScrollableContainer)
-        status = self.query_one("#status-bar", Static)
+        self._input.value = ""
 
         # Display user message
         user_msg = MessageDisplay("user", user_message)
-        await chat.mount(user_msg)
-        chat.scroll_end(animate=False)
-
-        # Show thinking indicator with animation
-        thinking_msg = Static(
-            "[bold green]🤖 Assistant:[/bold green]\n[dim italic]💭 Thinking...[/dim italic]",
-            classes="assistant-message thinking",
-            id="thinking-indicator"
-        )
-        await chat.mount(thinking_msg)
-        chat.scroll_end(animate=True)
+        await self._chat.mount(user_msg, before=self._thinking)
+        self._request_scroll()
+
+        # Show thinking indicator
+        self._thinking.display = True
+        self._request_scroll()
 
         # Update status
-        status.update("[yellow]⏳ Processing your request...[/yellow]")
+        self._status.update("[yellow]⏳ Processing your request...[/yellow]")
+
+        # Yield once so Textual can flush pending renders before blocking call
+        await asyncio.sleep(0)
 
-        # Force UI refresh before blocking call
-        await asyncio.sleep(0.1)
-        
         # Start processing in background
-        start_time = asyncio.get_event_loop().time()
-        
-        try:
-            # Run blocking process_message in thread pool to keep UI responsive
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                result = await loop.run_in_executor(
-                    executor, 
-                    self.assistant.process_message, 
-                    user_message
-                )
+        start_time = time.monotonic()
+        loop = asyncio.get_running_loop()
+
+        # Latest streamed answer text is set from the worker and flushed on a timer
+        streamed_text = ""
+        shown_text = ""
+        stream_msg = None
+
+        def set_streamed_text(text: str) -> None:
+            nonlocal streamed_text
+            streamed_text = text
+
+        def on_text(text: str) -> None:
+            loop.call_soon_threadsafe(set_streamed_text, text)
+
+        async def flush_stream() -> None:
+            nonlocal shown_text, stream_msg
+            if streamed_text == shown_text:
+                return
+            shown_text = streamed_text
+            if not shown_text:
+                # Answer turned into a tool call; go back to the thinking indicator
+                if stream_msg is not None:
+                    stream_msg.display = False
+                self._thinking.display = True
+                self._request_scroll()
+                return
+            self._thinking.display = False
+            if stream_msg is None:
+                stream_msg = Static(classes="assistant-message")
+                await self._chat.mount(stream_msg, before=self._thinking)
+            stream_msg.display = True
+            stream_msg.update(
+                f"[bold green]🤖 Assistant:[/bold green]\n{escape(shown_text)}"
+            )
+            self._request_scroll()
 
-            # Ensure thinking indicator shows for at least 0.5 seconds
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed < 0.5:
-                await asyncio.sleep(0.5 - elapsed)
+        stream_timer = self.set_interval(STREAM_FLUSH_INTERVAL, flush_stream)
 
-            # Remove thinking indicator
-            thinking_msg.remove()
+        try:
+            # See DOCUMENT_ID_RE for which messages are cached
+            cacheable = DOCUMENT_ID_RE.search(user_message) is not None
+            cache_key = (self.session_id, user_message.lower())
+            result = self._response_cache.get(cache_key) if cacheable else None
+            cached = result is not None
+            if cached:
+                self._response_cache.move_to_end(cache_key)
+                # Keep session history and checkpoint in sync with what the user sees
+                await asyncio.to_thread(
+                    self.assistant.record_turn, user_message, result["response"]
+                )
+            else:
+                # Run blocking process_message in the default thread pool to keep UI responsive
+                result = await asyncio.to_thread(
+                    self.assistant.process_message, user_message, on_text
+                )
+                if cacheable and result["success"] and result["response"]:
+                    self._response_cache[cache_key] = result
+                    if len(self._response_cache) > RESPONSE_CACHE_MAX:
+                        self._response_cache.popitem(last=False)
+            stream_timer.stop()
+
+            # In debug mode, keep thinking indicator visible for at least 0.5 seconds
+            if self.debug_thinking:
+                elapsed = time.monotonic() - start_time
+                if elapsed < 0.5:
+                    await asyncio.sleep(0.5 - elapsed)
+
+            # Hide thinking indicator and remove streamed preview; the final message replaces it
+            self._thinking.display = False
+            if stream_msg is not None:
+                stream_msg.remove()
 
             if result["success"]:
                 # Display assistant response
@@ -343,116 +458,122 @@ class DocumentAssistantApp(App):
                     result["response"] or "No response generated.",
                     metadata={
                         "intent": result.get("intent"),
-                        "tools_used": result.get("tools_used", []),
+                        # Tools did not run for a cached reply
+                        "tools_used": [] if cached else result.get("tools_used", []),
                         "sources": result.get("sources", []),
+                        "cached": cached,
                     },
                 )
-                await chat.mount(assistant_msg)
-                chat.scroll_end(animate=False)
+                await self._chat.mount(assistant_msg, before=self._thinking)
+                self._request_scroll()
 
-                status.update("[green]✓ Response received[/green]")
+                self._status.update("[green]✓ Response received[/green]")
             else:
                 # Display error
                 error_msg = MessageDisplay(
                     "assistant",
                     f"❌ Error: {result.get('error', 'Unknown error')}",
                 )
-                await chat.mount(error_msg)
-                chat.scroll_end(animate=False)
+                await self._chat.mount(error_msg, before=self._thinking)
+                self._request_scroll()
 
-                status.update("[red]❌ Error occurred[/red]")
+                self._status.update("[red]❌ Error occurred[/red]")
 
         except Exception as e:
-            # Remove thinking indicator if still present
+            stream_timer.stop()
+
+            # Hide thinking indicator and remove streamed preview if still present
+            self._thinking.display = False
             try:
-                thinking_msg.remove()
+                if stream_msg is not None:
+                    stream_msg.remove()
             except:
                 pass
             
             error_msg = MessageDisplay("assistant", f"❌ Unexpected error: {str(e)}")
-            await chat.mount(error_msg)
-            chat.scroll_end(animate=False)
-            status.update(f"[red]❌ Error: {str(e)}[/red]")
+            await self._chat.mount(error_msg, before=self._thinking)
+            self._request_scroll()
+            self._status.update(f"[red]❌ Error: {str(e)}[/red]")
+
+    def _request_scroll(self) -> None:
+        """Schedule a single scroll to the end of the chat after the next refresh."""
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.call_after_refresh(self._do_scroll)
+
+    def _do_scroll(self) -> None:
+        self._scroll_pending = False
+        self._chat.scroll_end(animate=False)
 
     def action_show_docs(self) -> None:
         """Show available documents."""
         if not self.assistant:
             return
 
-        docs_text = "📚 Available Documents:\n\n"
+        parts = ["📚 Available Documents:", ""]
         for doc_id, doc in self.assistant.retriever.documents.items():
-            docs_text += f"• {doc_id}: {doc.title} ({doc.doc_type})\n"
-            if "total" in doc.metadata:
-                docs_text += f"  Amount: ${doc.metadata['total']:,.2f}\n"
+            parts.append(f"• {doc_id}: {doc.title} ({doc.doc_type})")
+            total = doc.metadata.get("total")
+            if total is not None:
+                parts.append(f"  Amount: ${total:,.2f}")
+        docs_text = "\n".join(parts)
 
         self.push_screen(InfoScreen(docs_text, "Documents"))
 
     def action_show_help(self) -> None:
         """Show help information."""
-        help_text = """
-# Document Assistant Help
-
-## Example Queries
-
-### Q&A
-- What's the total amount in invoice INV-001?
-- What are the terms of contract CON-001?
-- Show me details about claim CLM-001
-
-### Summarization
-- Summarize all contracts
-- Give me a summary of invoice INV-002
-- Summarize the insurance claims
-
-### Calculations
-- Calculate the sum of all invoice totals
-- What's the average amount of all documents?
-- Add the totals from INV-001 and INV-002
-
-## Keyboard Shortcuts
-- **Ctrl+D** - Show documents
-- **Ctrl+H** - Show this help
-- **Ctrl+N** - Start new session
-- **Ctrl+Q** - Quit application
-- **Enter** - Send message
-"""
-        self.push_screen(InfoScreen(help_text, "Help"))
+        self.push_screen(InfoScreen(_HELP_MD, "Help"))
 
     def action_new_session(self) -> None:
         """Start a new session."""
         if self.assistant:
             self.session_id = self.assistant.start_session("textual_user")
-            session_info = self.query_one("#session-info", Static)
-            session_info.update(
+            self._response_cache.clear()
+            self._session_info.update(
                 f"[green]✓ New Session: {self.session_id[:8]}...[/green]\n"
-                f"[dim]Started: {datetime.now().strftime('%H:%M:%S')}[/dim]"
+                f"[dim]Started: {time.strftime('%H:%M:%S')}[/dim]"
             )
-            status = self.query_one("#status-bar", Static)
-            status.update("[green]✓ New session started[/green]")
+            self._status.update("[green]✓ New session started[/green]")
 
 
 class InfoScreen(Screen):
     """Modal screen to display information."""
 
-    def __init__(self, content: str, title: str = "Info"):
+    def __init__(self, content: RenderableType, title: str = "Info"):
         super().__init__()
         self.content = content
-        self.title = title
+        self._title = title
 
     def compose(self) -> ComposeResult:
+        if isinstance(self.content, str):
+            info = [Static(f"[bold]{self._title}[/bold]\n\n{self.content}", id="info-content")]
+        else:
+            # Pre-built renderables (e.g. Markdown) are shown as-is below the title
+            info = [
+                Static(f"[bold]{self._title}[/bold]\n"),
+                Static(self.content, id="info-content"),
+            ]
         yield Container(
-            Static(f"[bold]{self.title}[/bold]\n\n{self.content}", id="info-content"),
+            *info,
             Button("Close", variant="primary", id="close-button"),
             id="info-dialog"
         )
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        if event.button.id == "close-button":
-            self.app.pop_screen()
+    @on(Button.Pressed, "#close-button")
+    def _on_close(self) -> None:
+        self.app.pop_screen()
 
 
 def main():
     """Run the Textual app."""
+    # Use uvloop when available (not supported on Windows)
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     app = DocumentAssistantApp()
     app.run()
 
@@ -1,6 +1,5 @@
 from typing import TypedDict, Annotated, List, Dict, Any, Optional, Literal
 
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 from langgraph.graph import StateGraph, END
@@ -13,7 +12,7 @@ from schemas import (
     UserIntent, SessionState,
     AnswerResponse, SummarizationResponse, CalculationResponse, UpdateMemoryResponse
 )
-from prompts import get_intent_classification_prompt, get_chat_prompt_template, MEMORY_SUMMARY_PROMPT
+from prompts import get_intent_classification_prompt, get_chat_prompt_template, MEMORY_SUMMARY_TEMPLATE
 
 
 class AgentState(TypedDict):
@@ -184,10 +183,7 @@ def update_memory(state: AgentState, config: RunnableConfig) -> AgentState:
     # Retrieve the LLM from config
     llm = config.get("configurable").get("llm")
 
-    prompt_with_history = ChatPromptTemplate.from_messages([
-        SystemMessagePromptTemplate.from_template(MEMORY_SUMMARY_PROMPT),
-        MessagesPlaceholder("chat_history"),
-    ]).invoke({
+    prompt_with_history = MEMORY_SUMMARY_TEMPLATE.invoke({
         "chat_history": state.get("messages", []),
     })
 
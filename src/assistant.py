@@ -1,10 +1,10 @@
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 import uuid
 
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk, HumanMessage
 from langchain_openai import ChatOpenAI
 
 from schemas import SessionState
@@ -13,6 +13,11 @@ from tools import get_all_tools, ToolLogger
 from agent import create_workflow, AgentState
 from prompts import MEMORY_SUMMARY_PROMPT
 
+# Workflow nodes whose answers are streamed to the UI
+STREAMING_NODES = {"qa_agent", "summarization_agent", "calculation_agent"}
+# Model-calling node of the prebuilt ReAct agent (excludes generate_structured_response)
+REACT_MODEL_NODE = "agent"
+
 
 class DocumentAssistant:
     """
@@ -108,8 +113,84 @@ class DocumentAssistant:
         history = current_state.get("messages", [])
         return history
 
-    def process_message(self, user_input: str) -> Dict[str, Any]:
-        """Process a user message using the LangGraph workflow."""
+    def record_turn(self, user_input: str, response: str) -> None:
+        """
+        Record a turn answered without running the workflow (e.g. from a cache)
+        in the session history and the workflow checkpoint.
+        """
+        if not self.current_session:
+            raise ValueError("No active session. Call start_session() first.")
+
+        config = {"configurable": {"thread_id": self.current_session.session_id}}
+        messages = [HumanMessage(content=user_input), AIMessage(content=response)]
+        self.workflow.update_state(
+            config,
+            {"messages": messages, "user_input": user_input},
+            as_node="update_memory",
+        )
+
+        self.current_session.conversation_history.append(
+            {"user_input": user_input, "messages": messages}
+        )
+        self.current_session.last_updated = datetime.now()
+        self._save_session()
+
+    def _stream_workflow(
+        self, initial_state: AgentState, config, on_text: Callable[[str], None]
+    ) -> Dict[str, Any]:
+        """
+        Run the workflow, passing the text of the answer being generated to on_text.
+        Only the ReAct model calls inside the agent nodes are forwarded; intent
+        classification, memory updates and structured-response passes are skipped.
+        """
+        final_state = {}
+        message_id = None
+        text = ""
+        # subgraphs=True is required: the ReAct agent runs as a nested graph inside
+        # the agent nodes, and its model calls are not streamed otherwise
+        for namespace, mode, payload in self.workflow.stream(
+            initial_state,
+            config=config,
+            stream_mode=["messages", "values"],
+            subgraphs=True,
+        ):
+            if mode == "values":
+                # Only the root graph's values are the final workflow state
+                if namespace == ():
+                    final_state = payload
+                continue
+            chunk, metadata = payload
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            top_node = namespace[0].split(":", 1)[0] if namespace else None
+            if (
+                top_node not in STREAMING_NODES
+                or metadata.get("langgraph_node") != REACT_MODEL_NODE
+                or "nostream" in (metadata.get("tags") or [])
+            ):
+                continue
+            # Each model call starts a new message; the preview shows only the latest
+            if chunk.id != message_id:
+                message_id = chunk.id
+                text = ""
+            if chunk.tool_call_chunks:
+                # Intermediate step before a tool call, not the final answer
+                if text:
+                    text = ""
+                    on_text(text)
+                continue
+            if isinstance(chunk.content, str) and chunk.content:
+                text += chunk.content
+                on_text(text)
+        return final_state
+
+    def process_message(
+        self, user_input: str, on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a user message using the LangGraph workflow.
+        If on_text is given, it receives the answer text generated so far as it streams.
+        """
 
         # Complete the config dictionary to set the thread_id, llm, and tools to the workflow
         config = {
@@ -139,7 +220,10 @@ class DocumentAssistant:
         }
         try:
             # Invoke the workflow with a thread_id equal to the session_id
-            final_state = self.workflow.invoke(initial_state, config=config)
+            if on_text:
+                final_state = self._stream_workflow(initial_state, config, on_text)
+            else:
+                final_state = self.workflow.invoke(initial_state, config=config)
             # Update session with new state
             if final_state.get("messages"):
 
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from langchain_core.prompts import (
     PromptTemplate,
     ChatPromptTemplate,
@@ -9,6 +11,7 @@ from langchain_core.prompts.chat import (
 )
 
 
+@lru_cache(maxsize=None)
 def get_intent_classification_prompt() -> PromptTemplate:
     """
     Get the intent classification prompt template.
@@ -89,19 +92,18 @@ Guidelines:
 Remember: Use the calculator tool for every calculation, even basic addition or subtraction."""
 
 
-def get_chat_prompt_template(intent_type: str) -> ChatPromptTemplate:
-    """
-    Get the appropriate chat prompt template based on intent.
-    """
-    if intent_type == "qa":
-        system_prompt = QA_SYSTEM_PROMPT
-    elif intent_type == "summarization":
-        system_prompt = SUMMARIZATION_SYSTEM_PROMPT
-    elif intent_type == "calculation":
-        system_prompt = CALCULATION_SYSTEM_PROMPT
-    else:
-        system_prompt = QA_SYSTEM_PROMPT  # Default fallback
+# Memory Summary Prompt
+MEMORY_SUMMARY_PROMPT = """Summarize the following conversation history into a concise summary:
+
+Focus on:
+- Key topics discussed
+- Documents referenced
+- Important findings or calculations
+- Any unresolved questions
+"""
 
+
+def _build_chat_template(system_prompt: str) -> ChatPromptTemplate:
     return ChatPromptTemplate.from_messages(
         [
             SystemMessagePromptTemplate.from_template(system_prompt),
@@ -111,12 +113,28 @@ def get_chat_prompt_template(intent_type: str) -> ChatPromptTemplate:
     )
 
 
-# Memory Summary Prompt
-MEMORY_SUMMARY_PROMPT = """Summarize the following conversation history into a concise summary:
+# Static templates, parsed once at import time
+_QA_TEMPLATE = _build_chat_template(QA_SYSTEM_PROMPT)
+_SUM_TEMPLATE = _build_chat_template(SUMMARIZATION_SYSTEM_PROMPT)
+_CALC_TEMPLATE = _build_chat_template(CALCULATION_SYSTEM_PROMPT)
 
-Focus on:
-- Key topics discussed
-- Documents referenced
-- Important findings or calculations
-- Any unresolved questions
-"""
+_CHAT_TEMPLATES = {
+    "qa": _QA_TEMPLATE,
+    "summarization": _SUM_TEMPLATE,
+    "calculation": _CALC_TEMPLATE,
+}
+
+MEMORY_SUMMARY_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        SystemMessagePromptTemplate.from_template(MEMORY_SUMMARY_PROMPT),
+        MessagesPlaceholder("chat_history"),
+    ]
+)
+
+
+def get_chat_prompt_template(intent_type: str) -> ChatPromptTemplate:
+    """
+    Get the appropriate chat prompt template based on intent.
+    Falls back to the Q&A template for unknown intents.
+    """
+    return _CHAT_TEMPLATES.get(intent_type, _QA_TEMPLATE)